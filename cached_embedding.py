@@ -0,0 +1,90 @@
+import hashlib
+import sqlite3
+from array import array
+
+from llama_index.core.bridge.pydantic import Field
+from llama_index.embeddings.openai import OpenAIEmbedding
+
+# Seconds to wait for another process to finish writing to the cache before giving up
+CACHE_TIMEOUT = 60
+# Maximum number of keys looked up per query, to stay below SQLite's bound parameter limit
+CACHE_LOOKUP_BATCH_SIZE = 500
+
+
+class CachedOpenAIEmbedding(OpenAIEmbedding):
+    """
+    An OpenAI embedding model that caches text embeddings on disk, keyed by a hash of
+    the model name and the text, so that unchanged chunks are never embedded twice.
+
+    The cache is a SQLite database, which serialises writes between processes, so it can
+    be shared by the workers indexing several PDFs in parallel.
+    """
+
+    cache_path: str = Field(description="The path of the SQLite database holding cached embeddings.")
+
+    def _cache_keys(self, texts):
+        return [
+            hashlib.sha256(f"{self.model_name}\0{text}".encode("utf-8")).hexdigest()
+            for text in texts
+        ]
+
+    def _connect(self):
+        connection = sqlite3.connect(self.cache_path, timeout=CACHE_TIMEOUT)
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vec BLOB NOT NULL)"
+        )
+        return connection
+
+    def _cache_lookup(self, keys):
+        found = {}
+        connection = self._connect()
+        try:
+            for i in range(0, len(keys), CACHE_LOOKUP_BATCH_SIZE):
+                batch = keys[i : i + CACHE_LOOKUP_BATCH_SIZE]
+                placeholders = ", ".join("?" * len(batch))
+                found.update(
+                    connection.execute(
+                        f"SELECT key, vec FROM embeddings WHERE key IN ({placeholders})", batch
+                    )
+                )
+        finally:
+            connection.close()
+
+        return [array("d", found[key]).tolist() if key in found else None for key in keys]
+
+    def _cache_store(self, keys, embeddings):
+        connection = self._connect()
+        try:
+            with connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vec) VALUES (?, ?)",
+                    [(key, array("d", embedding).tobytes()) for key, embedding in zip(keys, embeddings)],
+                )
+        finally:
+            connection.close()
+
+    def _get_text_embeddings(self, texts):
+        keys = self._cache_keys(texts)
+        embeddings = self._cache_lookup(keys)
+
+        misses = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if misses:
+            new_embeddings = super()._get_text_embeddings([texts[i] for i in misses])
+            self._cache_store([keys[i] for i in misses], new_embeddings)
+            for i, embedding in zip(misses, new_embeddings):
+                embeddings[i] = embedding
+
+        return embeddings
+
+    async def _aget_text_embeddings(self, texts):
+        keys = self._cache_keys(texts)
+        embeddings = self._cache_lookup(keys)
+
+        misses = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if misses:
+            new_embeddings = await super()._aget_text_embeddings([texts[i] for i in misses])
+            self._cache_store([keys[i] for i in misses], new_embeddings)
+            for i, embedding in zip(misses, new_embeddings):
+                embeddings[i] = embedding
+
+        return embeddings
@@ -1,55 +1,477 @@
-import logging
+import asyncio
+import gc
+import mmap
+import multiprocessing
 import os
-import time
-from glob import glob
-from pathlib import Path
+import pickle
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from contextlib import nullcontext
+from functools import lru_cache
+from itertools import islice
 
-from yaspin import yaspin
-from yaspin.spinners import Spinners
+from dotenv import load_dotenv
 
-spinner = yaspin(Spinners.dots, color="blue")
+import inquirer
 
-with spinner:
-    from dotenv import load_dotenv
+import numpy as np
 
-    import sys
+# Shown while waiting on slow operations; replaced by a yaspin spinner in main() when attached to a terminal
+spinner = nullcontext()
+
+load_dotenv()
+
+PATH_TO_PDFS = "pdfs"
+PATH_TO_INDEXES = "gpt_indexes"
+
+# Number of pages read, embedded and inserted into an index at a time
+PDF_PAGE_BATCH_SIZE = 500
+# Number of threads used to extract text from the pages of a batch
+PDF_EXTRACT_WORKERS = min(8, os.cpu_count() or 1)
+
+EMBEDDING_CACHE_PATH = f"{PATH_TO_INDEXES}/.embcache.sqlite3"
+
+# Name of the Chroma collection holding a document's embeddings within its index directory
+CHROMA_COLLECTION_NAME = "pydocuchat"
+# Collection a document is indexed into, renamed to CHROMA_COLLECTION_NAME once indexing succeeds
+CHROMA_BUILD_COLLECTION_NAME = "pydocuchat-building"
+# Written last when an index is saved, so an index directory without it is incomplete.
+# Chroma-backed indexes read nothing else from the JSON files persisted alongside it.
+INDEX_COMPLETE_MARKER = "index_store.json"
+# Vector store file of indexes created before embeddings were kept in Chroma
+LEGACY_VECTOR_STORE_FILE = "default__vector_store.json"
+
+# Models used to answer questions, overridable with the PYDOCUCHAT_MODEL environment variable.
+# The Ollama model is used instead of OpenAI when OLLAMA_HOST is set.
+DEFAULT_OPENAI_MODEL = "gpt-4o-mini"
+DEFAULT_OLLAMA_MODEL = "llama3.2:3b-instruct-q4_K_M"
+
+QA_PROMPT_TMPL = (
+    "We have provided context information below. \n"
+    "---------------------\n"
+    "{context_str}"
+    "\n---------------------\n"
+    "Given this information above, please answer the question clearly but as concisely as possible: {query_str}\n"
+)
+
+# Identifies the configured LLM, e.g. "openai/gpt-4o-mini", or None until _configure_llm() has run
+_llm_model_name = None
+
+# Loaded indexes, keyed by PDF name, kept for the lifetime of the process
+_INDEX_CACHE = {}
+
+# Full response texts keyed by (PDF name, whitespace-collapsed query), least recently used first
+_RESPONSE_CACHE = OrderedDict()
+RESPONSE_CACHE_SIZE = 256
+
+# Directory listings keyed by path, stored with the directory's mtime so that they can be reused until it changes
+_DIRECTORY_CACHE = {}
+
+SEMANTIC_CACHE_PATH = f"{PATH_TO_INDEXES}/.semcache.pkl"
+SEMANTIC_CACHE_THRESHOLD = 0.92
+
+
+class CachedResponse:
+    """
+    A replayable stand-in for a streaming query response, holding the full answer text.
+    """
+
+    def __init__(self, text):
+        self.text = text
+
+    def print_response_stream(self):
+        sys.stdout.write(self.text)
 
-    import inquirer
 
-    from llama_index.llms.openai import OpenAI
+class SemanticCache:
+    """
+    Caches query responses keyed by the embedding of the query, so that semantically
+    equivalent questions about the same document are answered without calling the LLM.
+
+    Embeddings are stored normalised as rows of a single float32 matrix, with the
+    responses, PDF names and the names of the models that produced the responses held
+    in parallel lists.
+
+    The cache is read from disk on first use. Every change re-reads the file before
+    writing it back, so entries added by other sessions since then are kept.
+    """
+
+    def __init__(self, path, threshold=SEMANTIC_CACHE_THRESHOLD):
+        self.path = path
+        self.threshold = threshold
+        self._loaded = False
+        self._clear()
+
+    def _clear(self):
+        self.embeddings = None
+        self.responses = []
+        self.pdf_names = []
+        self.model_names = []
+
+    def load(self):
+        """
+        Loads the cache from disk, replacing what is held in memory.
+        A missing or unreadable cache file leaves the cache empty.
+        """
+        self._loaded = True
+        self._clear()
+        if not os.path.isfile(self.path):
+            return
+
+        try:
+            with open(self.path, "rb") as f:
+                (
+                    self.embeddings,
+                    self.responses,
+                    self.pdf_names,
+                    self.model_names,
+                ) = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, ValueError, TypeError):
+            self._clear()
+
+    def save(self):
+        """
+        Persists the cache to disk.
+        The cache is written to a temporary file which then replaces the old one, so an
+        interrupted write never leaves a truncated cache behind.
+        """
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(
+                (self.embeddings, self.responses, self.pdf_names, self.model_names), f
+            )
+        os.replace(tmp_path, self.path)
+
+    def lookup(self, embedding, pdf_name, model_name):
+        """
+        Finds the cached response whose query is most similar to the given one.
+        Only responses about the same document produced by the same model are considered.
+
+        Args:
+            embedding (list[float]): The embedding of the user's query.
+            pdf_name (str): The name of the PDF document's index being queried.
+            model_name (str): The name of the model answering the query.
+
+        Returns the cached response text, or None if no entry is similar enough.
+        """
+        if not self._loaded:
+            self.load()
+        if self.embeddings is None:
+            return None
+
+        query = np.asarray(embedding, dtype=np.float32)
+        similarities = np.dot(self.embeddings, query) / np.linalg.norm(query)
+        similarities[np.array(self.pdf_names) != pdf_name] = -1.0
+        similarities[np.array(self.model_names) != model_name] = -1.0
+
+        best = int(np.argmax(similarities))
+        if similarities[best] > self.threshold:
+            return self.responses[best]
+        return None
+
+    def add(self, embedding, response_text, pdf_name, model_name):
+        """
+        Adds a query response to the cache and persists it to disk.
+
+        Args:
+            embedding (list[float]): The embedding of the user's query.
+            response_text (str): The full text of the response.
+            pdf_name (str): The name of the PDF document's index that was queried.
+            model_name (str): The name of the model that produced the response.
+        """
+        self.load()
+
+        row = np.asarray(embedding, dtype=np.float32)
+        row = (row / np.linalg.norm(row))[np.newaxis, :]
+
+        if self.embeddings is None:
+            self.embeddings = row
+        else:
+            self.embeddings = np.vstack([self.embeddings, row])
+        self.responses.append(response_text)
+        self.pdf_names.append(pdf_name)
+        self.model_names.append(model_name)
+        self.save()
+
+    def invalidate(self, pdf_name):
+        """
+        Removes all cached responses for a document, e.g. after it has been re-indexed.
+
+        Args:
+            pdf_name (str): The name of the PDF document's index.
+        """
+        self.load()
+        if pdf_name not in self.pdf_names:
+            return
+
+        keep = [i for i, name in enumerate(self.pdf_names) if name != pdf_name]
+        self.embeddings = self.embeddings[keep] if keep else None
+        self.responses = [self.responses[i] for i in keep]
+        self.pdf_names = [self.pdf_names[i] for i in keep]
+        self.model_names = [self.model_names[i] for i in keep]
+        self.save()
+
+
+semantic_cache = SemanticCache(SEMANTIC_CACHE_PATH)
+
+
+def _configure_llm():
+    """
+    Configures the LLM and embedding model used by llama_index.
+    This is done on first use rather than at import, as importing llama_index is slow.
+    """
+    global _llm_model_name
+    if _llm_model_name is not None:
+        return
+
     from llama_index.core import Settings
-    from llama_index.core import StorageContext
-    from llama_index.core import VectorStoreIndex
-    from llama_index.core import SimpleDirectoryReader
+
+    from cached_embedding import CachedOpenAIEmbedding
+
+    ollama_host = os.environ.get("OLLAMA_HOST")
+    if ollama_host:
+        from llama_index.llms.ollama import Ollama
+
+        if "://" not in ollama_host:
+            ollama_host = f"http://{ollama_host}"
+        model = os.environ.get("PYDOCUCHAT_MODEL", DEFAULT_OLLAMA_MODEL)
+        Settings.llm = Ollama(model=model, base_url=ollama_host, temperature=0)
+        model_name = f"ollama/{model}"
+    else:
+        from llama_index.llms.openai import OpenAI
+
+        model = os.environ.get("PYDOCUCHAT_MODEL", DEFAULT_OPENAI_MODEL)
+        Settings.llm = OpenAI(model=model, temperature=0)
+        model_name = f"openai/{model}"
+    Settings.embed_model = CachedOpenAIEmbedding(
+        cache_path=EMBEDDING_CACHE_PATH, embed_batch_size=100
+    )
+    _llm_model_name = model_name
+
+
+@lru_cache(maxsize=None)
+def get_qa_prompt():
+    """
+    Builds the prompt template used to answer questions about a document.
+    """
     from llama_index.core import PromptTemplate
-    from llama_index.core import load_index_from_storage
 
-    from llama_index.core.prompts.default_prompts import DEFAULT_REFINE_PROMPT
+    return PromptTemplate(QA_PROMPT_TMPL)
 
-load_dotenv()
 
-Settings.llm = OpenAI(model="gpt-3.5-turbo")
+def extract_page_texts(pdf_path, start, stop):
+    """
+    Extracts the text of a range of pages from a PDF document.
+    Each call memory-maps the file and opens its own reader, as pypdf readers
+    cannot safely be shared between threads.
 
-PATH_TO_PDFS = "pdfs"
-PATH_TO_INDEXES = "gpt_indexes"
+    Args:
+        pdf_path (str): The file path to the PDF document.
+        start (int): The index of the first page to extract.
+        stop (int): The index after the last page to extract.
+    Returns a list of page texts.
+    """
+    import pypdf
+
+    with open(pdf_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        reader = pypdf.PdfReader(mm)
+        return [reader.pages[i].extract_text() for i in range(start, stop)]
+
+
+def load_pdf_mmap(pdf_path):
+    """
+    Reads a PDF document page by page, yielding one Document per page.
+    The file is memory-mapped and handed to pypdf directly, so it is never copied
+    into a Python bytes object. Pages are extracted PDF_PAGE_BATCH_SIZE at a time,
+    with each batch split into contiguous ranges extracted on a thread pool.
+
+    Args:
+        pdf_path (str): The file path to the PDF document.
+    """
+    import pypdf
+    from llama_index.core import Document
+
+    file_name = os.path.basename(pdf_path)
+
+    with open(pdf_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        page_labels = pypdf.PdfReader(mm).page_labels
+    num_pages = len(page_labels)
+
+    with ThreadPoolExecutor(max_workers=PDF_EXTRACT_WORKERS) as executor:
+        for batch_start in range(0, num_pages, PDF_PAGE_BATCH_SIZE):
+            batch_stop = min(batch_start + PDF_PAGE_BATCH_SIZE, num_pages)
+            step = -(-(batch_stop - batch_start) // PDF_EXTRACT_WORKERS)
+            futures = {
+                start: executor.submit(extract_page_texts, pdf_path, start, min(start + step, batch_stop))
+                for start in range(batch_start, batch_stop, step)
+            }
+
+            # Yield in page order, regardless of which range finished first
+            for start, future in futures.items():
+                for page_number, text in enumerate(future.result(), start):
+                    yield Document(
+                        text=text,
+                        metadata={"page_label": page_labels[page_number], "file_name": file_name},
+                        excluded_embed_metadata_keys=["file_name"],
+                        excluded_llm_metadata_keys=["file_name"],
+                    )
+
+
+def batched(iterable, size):
+    """
+    Splits an iterable into lists of at most the given size.
+    """
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def get_chroma_client(path):
+    """
+    Opens the Chroma database persisted in an index directory, creating it if needed.
+
+    Args:
+        path (str): The index directory.
+    """
+    import chromadb
+
+    return chromadb.PersistentClient(
+        path=path, settings=chromadb.config.Settings(anonymized_telemetry=False)
+    )
+
+
+def get_chroma_vector_store(path, collection_name=CHROMA_COLLECTION_NAME, reset=False):
+    """
+    Opens a Chroma vector store persisted in an index directory, creating it if needed.
+
+    Args:
+        path (str): The index directory.
+        collection_name (str, optional): The collection to open. Defaults to CHROMA_COLLECTION_NAME.
+        reset (bool, optional): If True, any embeddings already stored are deleted first.
+                                Defaults to False.
+    """
+    from llama_index.vector_stores.chroma import ChromaVectorStore
+
+    client = get_chroma_client(path)
+    if reset:
+        try:
+            client.delete_collection(collection_name)
+        except ValueError:
+            pass
+    collection = client.get_or_create_collection(
+        collection_name, metadata={"hnsw:space": "cosine"}
+    )
+    return ChromaVectorStore(chroma_collection=collection)
+
+
+def promote_built_index(save_path):
+    """
+    Replaces a document's index with the one just built alongside it.
+    The completion marker is removed first, so that an interruption part way through
+    leaves the index marked incomplete rather than silently empty.
+
+    Args:
+        save_path (str): The index directory.
+    """
+    for file_name in (INDEX_COMPLETE_MARKER, LEGACY_VECTOR_STORE_FILE):
+        file_path = os.path.join(save_path, file_name)
+        if os.path.isfile(file_path):
+            os.remove(file_path)
+
+    client = get_chroma_client(save_path)
+    try:
+        client.delete_collection(CHROMA_COLLECTION_NAME)
+    except ValueError:
+        pass
+    client.get_collection(CHROMA_BUILD_COLLECTION_NAME).modify(name=CHROMA_COLLECTION_NAME)
 
 
 def pdf_to_index(pdf_path, save_path):
     """
     Converts a PDF document into an index for querying.
+    Pages are processed in batches of PDF_PAGE_BATCH_SIZE, so that memory use
+    does not grow with the length of the document. The index is built into a separate
+    collection and only replaces an existing index for the document once it is complete.
 
     Args:
         pdf_path (str): The file path to the PDF document.
         save_path (str): The directory path where the index should be saved.
     """
-    documents = SimpleDirectoryReader(input_files=[Path(pdf_path)]).load_data()
+    from llama_index.core import Settings
+    from llama_index.core import StorageContext
+    from llama_index.core import VectorStoreIndex
+    from llama_index.core.ingestion import arun_transformations
+
+    _configure_llm()
+
+    # Start from an empty build collection, discarding any left over from an interrupted run
+    vector_store = get_chroma_vector_store(save_path, CHROMA_BUILD_COLLECTION_NAME, reset=True)
+    storage_context = StorageContext.from_defaults(vector_store=vector_store)
+    index = VectorStoreIndex(nodes=[], storage_context=storage_context)
+    transformations = [*Settings.transformations, Settings.embed_model]
 
-    index = VectorStoreIndex.from_documents(documents)
+    for documents in batched(load_pdf_mmap(pdf_path), PDF_PAGE_BATCH_SIZE):
+        # Split and embed the batch (with embedding requests sent concurrently) before inserting it
+        nodes = asyncio.run(arun_transformations(documents, transformations))
+        index.insert_nodes(nodes)
+        for document in documents:
+            index.docstore.set_document_hash(document.get_doc_id(), document.hash)
+
+        del documents, nodes
+        gc.collect()
+
+    promote_built_index(save_path)
+    # Writes INDEX_COMPLETE_MARKER, marking the index as complete
     index.storage_context.persist(persist_dir=save_path)
 
     print("\033[0;32mSaved PDF index to disk\033[0m")
 
 
+def load_index(pdf_name):
+    """
+    Loads a document's index from disk, reusing it if it has already been loaded.
+
+    Indexes stored in Chroma are opened directly from its binary store, while indexes
+    created by older versions are loaded from their JSON files.
+
+    Args:
+        pdf_name (str): The name of the PDF document's index to load.
+    Raises FileNotFoundError if the index is missing or was never completely built.
+    """
+    index = _INDEX_CACHE.get(pdf_name)
+    if index is None:
+        from llama_index.core import StorageContext
+        from llama_index.core import VectorStoreIndex
+        from llama_index.core import load_index_from_storage
+
+        _configure_llm()
+        persist_dir = f"{PATH_TO_INDEXES}/{pdf_name}"
+        if not os.path.isfile(os.path.join(persist_dir, INDEX_COMPLETE_MARKER)):
+            raise FileNotFoundError(f"No complete index was found for {pdf_name}")
+
+        if os.path.isfile(os.path.join(persist_dir, LEGACY_VECTOR_STORE_FILE)):
+            storage_context = StorageContext.from_defaults(persist_dir=persist_dir)
+            index = load_index_from_storage(storage_context)
+        else:
+            index = VectorStoreIndex.from_vector_store(get_chroma_vector_store(persist_dir))
+        _INDEX_CACHE[pdf_name] = index
+    return index
+
+
+@lru_cache(maxsize=32)
+def _get_query_engine(pdf_name):
+    """
+    Builds a streaming query engine for a document's index, reusing it across queries.
+
+    Args:
+        pdf_name (str): The name of the PDF document's index to query.
+    """
+    index = load_index(pdf_name)
+    return index.as_query_engine(streaming=True, text_qa_template=get_qa_prompt())
+
+
 def query_index(query_u, pdf_name):
     """
     Queries an existing index with a user's prompt.
@@ -57,22 +479,66 @@ def query_index(query_u, pdf_name):
     Args:
         query_u (str): The user's query or question.
         pdf_name (str): The name of the PDF document's index to query.
+
+    Returns a response object exposing print_response_stream(). Repeated questions
+    (ignoring differences in whitespace) are answered from an in-memory cache.
     """
-    QA_PROMPT_TMPL = (
-        "We have provided context information below. \n"
-        "---------------------\n"
-        "{context_str}"
-        "\n---------------------\n"
-        "Given this information above, please answer the question clearly but as concisely as possible: {query_str}\n"
-    )
-    QA_PROMPT = PromptTemplate(QA_PROMPT_TMPL)
+    query = query_u.strip()
+    # Case is kept in the key, as it can change the meaning of a question (e.g. "US" vs "us")
+    key = (pdf_name, " ".join(query.split()))
+
+    response_text = _RESPONSE_CACHE.get(key)
+    if response_text is None:
+        response_text = _query_index_raw(pdf_name, query)
+        _RESPONSE_CACHE[key] = response_text
+        if len(_RESPONSE_CACHE) > RESPONSE_CACHE_SIZE:
+            _RESPONSE_CACHE.popitem(last=False)
+    else:
+        _RESPONSE_CACHE.move_to_end(key)
+
+    return CachedResponse(response_text)
 
-    storage_context = StorageContext.from_defaults(persist_dir=f"{PATH_TO_INDEXES}/{pdf_name}")
-    index = load_index_from_storage(storage_context)
-    query_engine = index.as_query_engine(streaming=True, text_qa_template=QA_PROMPT)
-    response = query_engine.query(query_u)
 
-    return response
+def _query_index_raw(pdf_name, query):
+    """
+    Queries an existing index and returns the full text of the response.
+    Answers to questions semantically equivalent to an earlier one are served
+    from the semantic cache.
+
+    Args:
+        pdf_name (str): The name of the PDF document's index to query.
+        query (str): The user's query.
+    """
+    from llama_index.core import QueryBundle
+    from llama_index.core import Settings
+
+    _configure_llm()
+
+    query_embedding = Settings.embed_model.get_query_embedding(query)
+    cached_text = semantic_cache.lookup(query_embedding, pdf_name, _llm_model_name)
+    if cached_text is not None:
+        return cached_text
+
+    response = _get_query_engine(pdf_name).query(QueryBundle(query, embedding=query_embedding))
+
+    response_text = "".join(response.response_gen)
+    semantic_cache.add(query_embedding, response_text, pdf_name, _llm_model_name)
+
+    return response_text
+
+
+def invalidate_caches(pdf_name):
+    """
+    Drops everything cached for a document, so that queries made after it has
+    been re-indexed are answered from the new index.
+
+    Args:
+        pdf_name (str): The name of the PDF document's index.
+    """
+    semantic_cache.invalidate(pdf_name)
+    _RESPONSE_CACHE.clear()
+    _INDEX_CACHE.pop(pdf_name, None)
+    _get_query_engine.cache_clear()
 
 
 def save_pdf(file_path, absolute=False):
@@ -86,6 +552,7 @@ def save_pdf(file_path, absolute=False):
                                    Defaults to False.
     """
     _, file_name = os.path.split(file_path)
+    invalidate_caches(file_name)
 
     if absolute:
         pdf_to_index(
@@ -98,6 +565,55 @@ def save_pdf(file_path, absolute=False):
         )
 
 
+def prefetch_files(paths):
+    """
+    Asks the kernel to start reading files into the page cache in the background,
+    so that later reads of them are served from memory.
+    Does nothing on platforms without posix_fadvise.
+
+    Args:
+        paths (list[str]): The file paths to prefetch.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+
+    for path in paths:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        finally:
+            os.close(fd)
+
+
+def save_pdfs_bulk(paths):
+    """
+    Saves several PDF documents at once, indexing them in parallel across CPU cores.
+
+    Args:
+        paths (list[str]): The file paths to the PDF documents.
+    """
+    # Index the largest files first, so that small files fill in around them instead of one
+    # large file being left running on its own at the end
+    paths = sorted(paths, key=os.path.getsize, reverse=True)
+
+    save_paths = []
+    for path in paths:
+        _, file_name = os.path.split(path)
+        invalidate_caches(file_name)
+        save_paths.append(f"{PATH_TO_INDEXES}/{file_name}")
+
+    # Start reading every file from disk up front, rather than one at a time as workers reach them
+    prefetch_files(paths)
+
+    # Spawn rather than fork workers: forking while the spinner thread holds the stdout lock
+    # can leave a child deadlocked on its first print
+    with ProcessPoolExecutor(
+        max_workers=os.cpu_count(), mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        # Consume the results so that errors raised in the workers are surfaced here
+        list(executor.map(pdf_to_index, paths, save_paths))
+
+
 def setup_directories(directories):
     """
     Ensures that the necessary directories for storing PDFs and their indexes exist.
@@ -141,16 +657,58 @@ def handle_document_query():
     process_queries(query_doc_choice)
 
 
+def _scan_directory(path, include):
+    """
+    Lists the entries of a directory that match a filter, in a single scandir pass.
+    The result is cached until the directory's modification time changes.
+
+    Args:
+        path (str): The directory to list.
+        include (Callable[[os.DirEntry], bool]): Returns whether an entry should be listed.
+    Returns a list of matching DirEntry objects.
+    """
+    mtime_ns = os.stat(path).st_mtime_ns
+    cached = _DIRECTORY_CACHE.get(path)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+
+    with os.scandir(path) as it:
+        entries = sorted((entry for entry in it if include(entry)), key=lambda entry: entry.name)
+    _DIRECTORY_CACHE[path] = (mtime_ns, entries)
+    return entries
+
+
+def _list_pdfs():
+    """
+    Returns the paths of the PDF documents in the PDFs directory.
+    """
+    entries = _scan_directory(
+        PATH_TO_PDFS,
+        lambda entry: entry.name.endswith(".pdf") and not entry.name.startswith(".") and entry.is_file(),
+    )
+    return [entry.path for entry in entries]
+
+
+def _list_indexes():
+    """
+    Returns the names of the completely built indexes in the indexes directory.
+    The completion marker is checked on every call, as writing it does not change the
+    modification time of the indexes directory itself.
+    """
+    return [
+        entry.name
+        for entry in _scan_directory(PATH_TO_INDEXES, lambda entry: entry.is_dir())
+        if os.path.isfile(os.path.join(entry.path, INDEX_COMPLETE_MARKER))
+    ]
+
+
 def get_index_directories():
     """
     Retrieves a list of directories that contain indexed documents.
     This list is used to present the user with the available documents for querying.
     Returns a list of directory names.
     """
-    return [
-        d for d in os.listdir(PATH_TO_INDEXES)
-        if os.path.isdir(os.path.join(PATH_TO_INDEXES, d))
-    ]
+    return _list_indexes()
 
 
 def prompt_document_selection(dirs):
@@ -197,9 +755,11 @@ def print_response(response):
     Args:
         response: The response object containing the answer to a query.
     """
-    print("\033[0;36m", end="")
+    # Write everything to the buffered stdout and flush once, rather than flushing per chunk
+    sys.stdout.write("\033[0;36m")
     response.print_response_stream()
-    print("\033[0m\n")
+    sys.stdout.write("\033[0m\n\n")
+    sys.stdout.flush()
 
 
 def handle_document_addition():
@@ -211,6 +771,8 @@ def handle_document_addition():
     add_doc_choice = prompt_document_addition()
     if add_doc_choice == "Enter the path to a PDF":
         handle_custom_pdf_path()
+    elif add_doc_choice == "Add all PDFs in folder":
+        handle_bulk_pdf_addition()
     else:
         with spinner:
             save_pdf(add_doc_choice)
@@ -224,8 +786,9 @@ def prompt_document_addition():
         docs: A list of documents available for addition, including an option to enter a path.
     Returns the user's choice.
     """
-    docs = glob(os.path.join(PATH_TO_PDFS, "*.pdf"))
+    docs = _list_pdfs()
     docs.insert(0, "Enter the path to a PDF")
+    docs.insert(1, "Add all PDFs in folder")
     add_doc_questions = [
         inquirer.List(
             "add_doc_choice",
@@ -254,6 +817,20 @@ def handle_custom_pdf_path():
         print("Added your PDF")
 
 
+def handle_bulk_pdf_addition():
+    """
+    Handles the case where the user chooses to add every PDF document in the PDFs directory.
+    """
+    docs = _list_pdfs()
+    if not docs:
+        print("\033[0;31mNo PDFs were found\033[0m")
+        return
+
+    with spinner:
+        save_pdfs_bulk(docs)
+    print(f"Added {len(docs)} PDFs")
+
+
 def handle_exit():
     """
     Handles the user's request to exit the application.
@@ -270,6 +847,13 @@ def main():
     then enters a loop to prompt the user with the main menu and 
     handle their choices until they decide to exit.
     """
+    global spinner
+    if sys.stdin.isatty():
+        from yaspin import yaspin
+        from yaspin.spinners import Spinners
+
+        spinner = yaspin(Spinners.dots, color="blue")
+
     setup_directories([PATH_TO_INDEXES, PATH_TO_PDFS])
 
     try: